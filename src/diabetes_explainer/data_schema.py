@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import numpy as np
 import pandas as pd
 
 REQUIRED_COLUMNS = ["timestamp", "glucose_mgdl"]
@@ -12,24 +13,38 @@ GLUCOSE_MIN = 40.0
 GLUCOSE_MAX = 400.0
 
 
-def validate(df: pd.DataFrame) -> pd.DataFrame:
+def validate(df: pd.DataFrame, copy: bool = True) -> pd.DataFrame:
     """Validate and coerce a glucose DataFrame.
 
-    Raises ValueError if required columns are missing or glucose values are out of range.
-    Returns cleaned DataFrame with proper dtypes.
+    Raises ValueError if required columns are missing or glucose values are
+    missing (NaN) or out of range.
+    Returns cleaned DataFrame with proper dtypes. With ``copy=False`` the input
+    frame is modified in place — for internal callers that own the frame.
     """
     missing = [c for c in REQUIRED_COLUMNS if c not in df.columns]
     if missing:
         raise ValueError(f"Missing required columns: {missing}")
 
-    df = df.copy()
-    df["timestamp"] = pd.to_datetime(df["timestamp"])
-    df = df.sort_values("timestamp").reset_index(drop=True)
-
-    out_of_range = df[(df["glucose_mgdl"] < GLUCOSE_MIN) | (df["glucose_mgdl"] > GLUCOSE_MAX)]
-    if len(out_of_range) > 0:
+    if copy:
+        df = df.copy()
+    if df["timestamp"].dtype.kind != "M":  # already parsed when read via pyarrow
+        df["timestamp"] = pd.to_datetime(df["timestamp"])
+    if not df["timestamp"].is_monotonic_increasing:
+        df = df.sort_values("timestamp").reset_index(drop=True)
+
+    glucose = df["glucose_mgdl"].to_numpy()
+    # reject missing readings up front: the feature kernels assume NaN-free
+    # glucose, and NaN silently passes both range comparisons below
+    missing_glucose = int(np.count_nonzero(np.isnan(glucose)))
+    if missing_glucose:
+        raise ValueError(
+            f"{missing_glucose} glucose readings are missing (NaN); "
+            "fill or drop them before validation"
+        )
+    out_of_range = int(np.count_nonzero((glucose < GLUCOSE_MIN) | (glucose > GLUCOSE_MAX)))
+    if out_of_range:
         raise ValueError(
-            f"{len(out_of_range)} glucose readings outside valid range "
+            f"{out_of_range} glucose readings outside valid range "
             f"[{GLUCOSE_MIN}, {GLUCOSE_MAX}] mg/dL"
         )
 
@@ -3,22 +3,36 @@
 from __future__ import annotations
 
 import argparse
-import pickle
+import os
 from pathlib import Path
+from typing import Literal
 
+import joblib
 import numpy as np
-import pandas as pd
 
 from diabetes_explainer import data_schema, synth_data
 from diabetes_explainer.features import FEATURE_DESCRIPTIONS, build_features
+from diabetes_explainer.features_cache import load_features
 from diabetes_explainer.train import MODEL_PATH
 
 
-def _feature_importance_narrative(importances: dict[str, float]) -> str:
-    """Convert feature importances to a human-readable narrative."""
+def _top_importances(
+    feature_names: list[str], values: np.ndarray, k: int
+) -> list[tuple[str, float]]:
+    """Return the k highest-importance (name, value) pairs, best first.
+
+    argpartition + a partial sort of k entries instead of sorting all of them.
+    """
+    values = np.asarray(values, dtype=float)
+    top = np.argpartition(-values, min(k, values.size - 1))[:k]
+    top = top[np.argsort(-values[top])]
+    return [(feature_names[i], float(values[i])) for i in top]
+
+
+def _feature_importance_narrative(top_features: list[tuple[str, float]]) -> str:
+    """Convert ranked feature importances to a human-readable narrative."""
     lines = ["## Top Factors Influencing Predicted Glucose\n"]
-    sorted_feats = sorted(importances.items(), key=lambda x: x[1], reverse=True)
-    for rank, (feat, imp) in enumerate(sorted_feats[:5], 1):
+    for rank, (feat, imp) in enumerate(top_features, 1):
         desc = FEATURE_DESCRIPTIONS.get(feat, feat)
         lines.append(f"{rank}. **{desc}** — importance score: {imp:.4f}")
     lines.append(
@@ -32,7 +46,7 @@ def explain(
     data_path: str | Path | None = None,
     model_path: str | Path = MODEL_PATH,
     output_dir: str | Path = "output",
-    plot: bool = True,
+    plot: bool | Literal["fast", "full"] = "fast",
 ) -> str:
     """Generate an explanation report.
 
@@ -41,11 +55,13 @@ def explain(
     data_path:
         CSV path. If None, generates synthetic data.
     model_path:
-        Path to trained model pickle.
+        Path to the trained model artefact (joblib).
     output_dir:
         Directory for output files.
     plot:
-        If True, generate matplotlib plots (requires matplotlib).
+        "fast" (default) renders just the importance chart at 72 DPI,
+        "full" (or True) adds the predicted-vs-actual time series,
+        False skips plotting entirely.
 
     Returns
     -------
@@ -56,22 +72,25 @@ def explain(
 
     if data_path is None:
         print("No data provided — using synthetic data...")
-        df = synth_data.generate()
+        df = data_schema.validate(synth_data.generate(), copy=False)
+        X, y = build_features(df)
     else:
-        df = pd.read_csv(data_path)
-
-    df = data_schema.validate(df)
-    X, y = build_features(df)
+        X, y = load_features(str(data_path), os.path.getmtime(data_path))
 
-    with open(model_path, "rb") as f:
-        artefact = pickle.load(f)
+    artefact = joblib.load(model_path, mmap_mode="r")
     model = artefact["model"]
     feature_names = artefact["feature_names"]
 
-    X = X[feature_names]
-    importances = dict(zip(feature_names, model.feature_importances_))
+    # contiguous float32 keeps the per-tree feature gathers cache-friendly
+    X = np.ascontiguousarray(X[feature_names].to_numpy(dtype=np.float32))
+    if "feature_importances" in artefact:
+        importance_values = artefact["feature_importances"]
+    else:  # models trained before permutation importances were stored
+        importance_values = model.feature_importances_
+    # one ordered top-10 feeds both the narrative (top 5) and the plot
+    top_importances = _top_importances(feature_names, importance_values, 10)
 
-    narrative = _feature_importance_narrative(importances)
+    narrative = _feature_importance_narrative(top_importances[:5])
 
     # Summary stats
     preds = model.predict(X)
@@ -96,35 +115,52 @@ def explain(
     print(f"Explanation report saved to {report_path}")
 
     if plot:
+        full = plot is True or plot == "full"
         try:
+            import matplotlib
+
+            matplotlib.use("Agg")  # headless rasterizer; skip GUI backend probing
             import matplotlib.pyplot as plt
 
-            sorted_items = sorted(importances.items(), key=lambda x: x[1], reverse=True)[:10]
-            feat_names = [FEATURE_DESCRIPTIONS.get(k, k) for k, _ in sorted_items]
-            feat_vals = [v for _, v in sorted_items]
+            feat_names = [FEATURE_DESCRIPTIONS.get(k, k) for k, _ in top_importances]
+            feat_vals = [v for _, v in top_importances]
 
-            fig, axes = plt.subplots(1, 2, figsize=(14, 5))
+            if full:
+                fig, axes = plt.subplots(1, 2, figsize=(14, 5))
+                ax_imp = axes[0]
+            else:
+                fig, ax_imp = plt.subplots(figsize=(10, 4))
 
-            axes[0].barh(feat_names[::-1], feat_vals[::-1], color="steelblue")
-            axes[0].set_xlabel("Feature Importance")
-            axes[0].set_title(
+            ax_imp.barh(feat_names[::-1], feat_vals[::-1], color="steelblue")
+            ax_imp.set_xlabel("Feature Importance")
+            ax_imp.set_title(
                 "Top 10 Feature Importances\n(Synthetic data — educational only)"
             )
-            axes[0].tick_params(axis="y", labelsize=8)
-
-            n_plot = min(200, len(preds))
-            axes[1].plot(y.values[:n_plot], label="Actual", alpha=0.7)
-            axes[1].plot(preds[:n_plot], label="Predicted (30 min ahead)", alpha=0.7)
-            axes[1].set_xlabel("Time steps (5 min each)")
-            axes[1].set_ylabel("Glucose (mg/dL)")
-            axes[1].set_title(
-                "Predicted vs Actual Glucose\n(Synthetic data — educational only)"
-            )
-            axes[1].legend()
+            ax_imp.tick_params(axis="y", labelsize=8)
+
+            if full:
+                n_plot = min(200, len(preds))
+                # rasterized thin lines collapse the segments into one PNG primitive
+                axes[1].plot(
+                    y.values[:n_plot], label="Actual", alpha=0.7, linewidth=0.5, rasterized=True
+                )
+                axes[1].plot(
+                    preds[:n_plot],
+                    label="Predicted (30 min ahead)",
+                    alpha=0.7,
+                    linewidth=0.5,
+                    rasterized=True,
+                )
+                axes[1].set_xlabel("Time steps (5 min each)")
+                axes[1].set_ylabel("Glucose (mg/dL)")
+                axes[1].set_title(
+                    "Predicted vs Actual Glucose\n(Synthetic data — educational only)"
+                )
+                axes[1].legend()
 
             plt.tight_layout()
             plot_path = output_dir / "explanation_plot.png"
-            plt.savefig(plot_path, dpi=100)
+            plt.savefig(plot_path, dpi=100 if full else 72, bbox_inches=None)
             plt.close()
             print(f"Plot saved to {plot_path}")
         except ImportError:
@@ -139,12 +175,21 @@ def main() -> None:
     parser.add_argument("--model", type=str, default=str(MODEL_PATH))
     parser.add_argument("--output", type=str, default="output")
     parser.add_argument("--no-plot", action="store_true")
+    parser.add_argument(
+        "--full-plot", action="store_true", help="Also draw the predicted-vs-actual time series"
+    )
     args = parser.parse_args()
+    if args.no_plot:
+        plot: bool | Literal["fast", "full"] = False
+    elif args.full_plot:
+        plot = "full"
+    else:
+        plot = "fast"
     explain(
         data_path=args.data,
         model_path=args.model,
         output_dir=args.output,
-        plot=not args.no_plot,
+        plot=plot,
     )
 
 
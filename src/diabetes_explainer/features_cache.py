@@ -0,0 +1,41 @@
+"""Cached feature loading for repeated predict/explain invocations."""
+
+from __future__ import annotations
+
+import functools
+
+import pandas as pd
+
+from diabetes_explainer import data_schema
+from diabetes_explainer.features import build_features
+
+try:
+    import pyarrow  # noqa: F401
+
+    _CSV_ENGINE = "pyarrow"
+except ImportError:  # pyarrow is an optional speedup; the C engine works fine
+    _CSV_ENGINE = "c"
+
+
+def _read_glucose_csv(path: str) -> pd.DataFrame:
+    """Read a glucose CSV with column pushdown and upfront timestamp parsing.
+
+    Only the known schema columns are parsed (wide logs skip the rest), and
+    pyarrow's vectorized reader is used when available.
+    """
+    header = pd.read_csv(path, nrows=0).columns
+    usecols = [c for c in data_schema.ALL_COLUMNS if c in header]
+    parse_dates = ["timestamp"] if "timestamp" in usecols else False
+    return pd.read_csv(path, engine=_CSV_ENGINE, usecols=usecols, parse_dates=parse_dates)
+
+
+@functools.lru_cache(maxsize=8)
+def load_features(path: str, mtime: float) -> tuple[pd.DataFrame, pd.Series]:
+    """Read, validate and featurize a glucose CSV, memoized on (path, mtime).
+
+    The mtime key invalidates the cache entry when the file changes on disk.
+    Callers must not mutate the returned objects in place.
+    """
+    df = _read_glucose_csv(path)
+    df = data_schema.validate(df, copy=False)
+    return build_features(df)
@@ -3,16 +3,35 @@
 from __future__ import annotations
 
 import argparse
-import pickle
+import os
 from pathlib import Path
 
+import joblib
+import numpy as np
 import pandas as pd
+from joblib import Parallel, delayed
 
-from diabetes_explainer import data_schema
-from diabetes_explainer.features import build_features
+from diabetes_explainer.features_cache import load_features
 from diabetes_explainer.train import MODEL_PATH
 
 
+def _predict_one(
+    data_path: str | Path, model, feature_names: list[str], n_last: int
+) -> pd.DataFrame:
+    """Featurize one CSV and return its last `n_last` predictions."""
+    X, _ = load_features(str(data_path), os.path.getmtime(data_path))
+    # contiguous float32 keeps the per-tree feature gathers cache-friendly
+    X = np.ascontiguousarray(X[feature_names].to_numpy(dtype=np.float32))
+
+    predictions = model.predict(X)
+    result = pd.DataFrame(
+        {
+            "predicted_glucose_30min": predictions.round(1),
+        }
+    )
+    return result.tail(n_last)
+
+
 def predict(
     data_path: str | Path,
     model_path: str | Path = MODEL_PATH,
@@ -25,7 +44,7 @@ def predict(
     data_path:
         Path to CSV file with recent glucose readings.
     model_path:
-        Path to saved model pickle.
+        Path to the saved model artefact (joblib).
     n_last:
         Number of most recent predictions to return.
 
@@ -33,34 +52,58 @@ def predict(
     -------
     pd.DataFrame with column: predicted_glucose_30min
     """
-    df = pd.read_csv(data_path)
-    df = data_schema.validate(df)
+    artefact = joblib.load(model_path, mmap_mode="r")
+    return _predict_one(data_path, artefact["model"], artefact["feature_names"], n_last)
 
-    with open(model_path, "rb") as f:
-        artefact = pickle.load(f)
-    model = artefact["model"]
-    feature_names = artefact["feature_names"]
 
-    X, _ = build_features(df)
-    X = X[feature_names]
+def predict_many(
+    data_paths: list[str | Path],
+    model_path: str | Path = MODEL_PATH,
+    n_last: int = 1,
+    n_jobs: int = -1,
+) -> dict[str, pd.DataFrame]:
+    """Predict for several CGM streams (one CSV per patient) in parallel.
 
-    predictions = model.predict(X)
-    result = pd.DataFrame(
-        {
-            "predicted_glucose_30min": predictions.round(1),
-        }
+    Parameters
+    ----------
+    data_paths:
+        CSV paths, one per stream.
+    model_path:
+        Path to the saved model artefact (joblib), loaded once and shared.
+    n_last:
+        Number of most recent predictions to return per stream.
+    n_jobs:
+        Worker count for joblib.Parallel (-1 = all cores).
+
+    Returns
+    -------
+    dict mapping each path (as given) to its prediction DataFrame.
+    """
+    artefact = joblib.load(model_path, mmap_mode="r")
+    model = artefact["model"]
+    feature_names = artefact["feature_names"]
+    results = Parallel(n_jobs=n_jobs, backend="loky")(
+        delayed(_predict_one)(path, model, feature_names, n_last) for path in data_paths
     )
-    return result.tail(n_last)
+    return dict(zip((str(p) for p in data_paths), results))
 
 
 def main() -> None:
     parser = argparse.ArgumentParser(description="Predict future glucose values.")
-    parser.add_argument("--data", type=str, required=True, help="Path to CSV data file")
+    parser.add_argument(
+        "--data", type=str, required=True, nargs="+", help="Path(s) to CSV data file(s)"
+    )
     parser.add_argument("--model", type=str, default=str(MODEL_PATH))
     parser.add_argument("--n", type=int, default=5, help="Number of recent predictions to show")
     args = parser.parse_args()
-    result = predict(data_path=args.data, model_path=args.model, n_last=args.n)
-    print(result.to_string(index=False))
+    if len(args.data) == 1:
+        result = predict(data_path=args.data[0], model_path=args.model, n_last=args.n)
+        print(result.to_string(index=False))
+    else:
+        results = predict_many(args.data, model_path=args.model, n_last=args.n)
+        for path, result in results.items():
+            print(f"== {path} ==")
+            print(result.to_string(index=False))
 
 
 if __name__ == "__main__":
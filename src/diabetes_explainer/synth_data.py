@@ -13,6 +13,10 @@ from pathlib import Path
 import numpy as np
 import pandas as pd
 
+# generated frames memoized per parameter set; train/explain/tests regenerate
+# the same defaults repeatedly
+_GENERATE_CACHE: dict[tuple[int, int, int], pd.DataFrame] = {}
+
 
 def generate(
     n_days: int = 14,
@@ -38,6 +42,29 @@ def generate(
     pd.DataFrame with columns: timestamp, glucose_mgdl, carbs_g,
         insulin_units, activity_steps, heart_rate_bpm
     """
+    cache_key = (n_days, interval_minutes, seed)
+    cached = _GENERATE_CACHE.get(cache_key)
+    if cached is not None:
+        df = cached.copy()
+    else:
+        df = _generate_frame(n_days, interval_minutes, seed)
+        _GENERATE_CACHE[cache_key] = df.copy()
+
+    if output_path is not None:
+        output_path = Path(output_path)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        df.to_csv(output_path, index=False)
+        print(f"Synthetic data saved to {output_path}  ({len(df)} rows)")
+
+    return df
+
+
+def _generate_frame(n_days: int, interval_minutes: int, seed: int) -> pd.DataFrame:
+    """Run the actual simulation behind :func:`generate`.
+
+    All randomness is drawn as array-shaped batches (one rng call per
+    quantity, never scalar draws inside loops) — keep it that way.
+    """
     rng = np.random.default_rng(seed)
     n_points = int(n_days * 24 * 60 / interval_minutes)
     timestamps = pd.date_range("2024-01-01", periods=n_points, freq=f"{interval_minutes}min")
@@ -53,77 +80,83 @@ def generate(
 
     glucose = baseline.copy()
 
-    # simulate meal events
+    # simulate meal events (all days at once; per-meal columns are
+    # breakfast 7am ± 60min ~20g, lunch 12pm ± 90min ~70g, dinner 7pm ± 60min ~60g)
     carbs = np.zeros(n_points)
     insulin = np.zeros(n_points)
 
-    meals_per_day = [
-        (7 * 60, 60, 20),   # breakfast: 7am ± 60min, ~60g carbs
-        (12 * 60, 90, 70),  # lunch: 12pm ± 90min, ~70g carbs
-        (19 * 60, 60, 60),  # dinner: 7pm ± 60min, ~60g carbs
-    ]
-
-    for day in range(n_days):
-        day_offset = day * int(24 * 60 / interval_minutes)
-        for meal_min, jitter_min, carb_mean in meals_per_day:
-            meal_idx = day_offset + int(
-                (meal_min + rng.uniform(-jitter_min / 2, jitter_min / 2)) / interval_minutes
-            )
-            meal_idx = min(meal_idx, n_points - 1)
-            meal_carbs = max(0, rng.normal(carb_mean, 15))
-            carbs[meal_idx] = meal_carbs
-
-            # glucose rises after meal, peaks ~45-90 min later
-            peak_delay = int(rng.uniform(8, 18))  # steps
-            peak_rise = meal_carbs * rng.uniform(0.8, 1.5)
-            for k in range(min(30, n_points - meal_idx)):
-                rise = peak_rise * np.exp(-0.5 * ((k - peak_delay) / 6) ** 2)
-                glucose[meal_idx + k] = min(glucose[meal_idx + k] + rise, 350)
-
-            # insulin dose
-            insulin_dose = max(0, rng.normal(meal_carbs / 12, 1.0))
-            if meal_idx + 5 < n_points:
-                insulin[meal_idx + 5] = insulin_dose
-            # insulin lowers glucose 30-120 min after injection
-            for k in range(5, min(25, n_points - meal_idx)):
-                drop = insulin_dose * rng.uniform(3, 6) * np.exp(-0.3 * (k - 5))
-                glucose[meal_idx + k] = max(glucose[meal_idx + k] - drop, 55)
-
-    # activity effect
+    meal_min = np.array([7 * 60, 12 * 60, 19 * 60], dtype=float)
+    jitter_min = np.array([60, 90, 60], dtype=float)
+    carb_mean = np.array([20, 70, 60], dtype=float)
+
+    day_offsets = np.arange(n_days) * int(24 * 60 / interval_minutes)
+    meal_jitter = rng.uniform(-jitter_min / 2, jitter_min / 2, size=(n_days, 3))
+    meal_idx = day_offsets[:, None] + ((meal_min + meal_jitter) / interval_minutes).astype(int)
+    meal_idx = np.minimum(meal_idx, n_points - 1)
+    meal_carbs = np.maximum(0, rng.normal(carb_mean, 15, size=(n_days, 3)))
+    carbs[meal_idx.ravel()] = meal_carbs.ravel()
+
+    # glucose rises after meal, peaks ~45-90 min later: build the Gaussian rise
+    # kernel for every meal at once and scatter-add into the glucose trace
+    peak_delay = rng.uniform(8, 18, size=(n_days, 3)).astype(int)  # steps
+    peak_rise = meal_carbs * rng.uniform(0.8, 1.5, size=(n_days, 3))
+    k_rise = np.arange(30)
+    rise = peak_rise[..., None] * np.exp(-0.5 * ((k_rise - peak_delay[..., None]) / 6) ** 2)
+    rise_idx = meal_idx[..., None] + k_rise
+    in_range = rise_idx < n_points
+    np.add.at(glucose, rise_idx[in_range], rise[in_range])
+
+    # insulin dose, lowering glucose 30-120 min after injection
+    insulin_dose = np.maximum(0, rng.normal(meal_carbs / 12, 1.0))
+    dose_idx = meal_idx + 5
+    dosed = dose_idx < n_points
+    insulin[dose_idx[dosed]] = insulin_dose[dosed]
+    k_drop = np.arange(5, 25)
+    drop = (
+        insulin_dose[..., None]
+        * rng.uniform(3, 6, size=(n_days, 3, k_drop.size))
+        * np.exp(-0.3 * (k_drop - 5))
+    )
+    drop_idx = meal_idx[..., None] + k_drop
+    in_range = drop_idx < n_points
+    np.subtract.at(glucose, drop_idx[in_range], drop[in_range])
+
+    # activity effect: one afternoon walk per day
     steps = np.zeros(n_points)
-    for day in range(n_days):
-        day_offset = day * int(24 * 60 / interval_minutes)
-        walk_start = day_offset + int((rng.uniform(15, 17) * 60) / interval_minutes)
-        walk_dur = int(rng.uniform(20, 60) / interval_minutes)
-        walk_start = min(walk_start, n_points - 1)
-        for k in range(min(walk_dur, n_points - walk_start)):
-            steps[walk_start + k] = rng.uniform(80, 130)
-            glucose[walk_start + k] = max(glucose[walk_start + k] - rng.uniform(0.5, 2), 55)
+    walk_start = day_offsets + ((rng.uniform(15, 17, n_days) * 60) / interval_minutes).astype(int)
+    walk_start = np.minimum(walk_start, n_points - 1)
+    walk_dur = (rng.uniform(20, 60, n_days) / interval_minutes).astype(int)
+    k_walk = np.arange(walk_dur.max(initial=0))
+    walk_idx = walk_start[:, None] + k_walk
+    walking = (k_walk < walk_dur[:, None]) & (walk_idx < n_points)
+    steps[walk_idx[walking]] = rng.uniform(80, 130, size=walking.shape)[walking]
+    np.subtract.at(
+        glucose, walk_idx[walking], rng.uniform(0.5, 2, size=walking.shape)[walking]
+    )
 
     # heart rate (correlated with activity + small meal bump)
     hr = 70 + steps * 0.3 + carbs * 0.05 + rng.normal(0, 3, n_points)
-    hr = np.clip(hr, 45, 200)
 
-    # final glucose clamp
-    glucose = np.clip(glucose, 55, 350)
+    # final clamps and rounding, in place to avoid transient n-sized copies
+    np.clip(hr, 45, 200, out=hr)
+    np.round(hr, 1, out=hr)
+    np.clip(glucose, 55, 350, out=glucose)
+    np.round(glucose, 1, out=glucose)
+    np.round(carbs, 1, out=carbs)
+    np.round(insulin, 2, out=insulin)
+    np.round(steps, 0, out=steps)
 
     df = pd.DataFrame(
         {
             "timestamp": timestamps,
-            "glucose_mgdl": np.round(glucose, 1),
-            "carbs_g": np.round(carbs, 1),
-            "insulin_units": np.round(insulin, 2),
-            "activity_steps": np.round(steps, 0),
-            "heart_rate_bpm": np.round(hr, 1),
+            "glucose_mgdl": glucose,
+            "carbs_g": carbs,
+            "insulin_units": insulin,
+            "activity_steps": steps,
+            "heart_rate_bpm": hr,
         }
     )
 
-    if output_path is not None:
-        output_path = Path(output_path)
-        output_path.parent.mkdir(parents=True, exist_ok=True)
-        df.to_csv(output_path, index=False)
-        print(f"Synthetic data saved to {output_path}  ({len(df)} rows)")
-
     return df
 
 
@@ -4,11 +4,13 @@ from __future__ import annotations
 
 import argparse
 import json
-import pickle
 from pathlib import Path
 
+import joblib
+import numpy as np
 import pandas as pd
-from sklearn.ensemble import GradientBoostingRegressor
+from sklearn.ensemble import HistGradientBoostingRegressor
+from sklearn.inspection import permutation_importance
 from sklearn.metrics import mean_absolute_error, root_mean_squared_error
 from sklearn.model_selection import train_test_split
 
@@ -25,7 +27,7 @@ def train(
     test_size: float = 0.2,
     seed: int = 42,
 ) -> dict:
-    """Train gradient boosting model on glucose data.
+    """Train histogram gradient boosting model on glucose data.
 
     Parameters
     ----------
@@ -48,18 +50,23 @@ def train(
     else:
         df = pd.read_csv(data_path)
 
-    df = data_schema.validate(df)
+    df = data_schema.validate(df, copy=False)
     X, y = build_features(df)
 
     X_train, X_test, y_train, y_test = train_test_split(
         X, y, test_size=test_size, shuffle=False
     )
+    # fit and evaluate on contiguous arrays, matching the ndarray inputs
+    # predict/explain hand to model.predict
+    X_train = np.ascontiguousarray(X_train.to_numpy())
+    X_test = np.ascontiguousarray(X_test.to_numpy())
 
-    model = GradientBoostingRegressor(
-        n_estimators=200,
+    model = HistGradientBoostingRegressor(
+        max_iter=200,
         max_depth=4,
         learning_rate=0.05,
-        subsample=0.8,
+        early_stopping=True,
+        validation_fraction=0.1,
         random_state=seed,
     )
     model.fit(X_train, y_train)
@@ -68,6 +75,12 @@ def train(
     mae = float(mean_absolute_error(y_test, y_pred))
     rmse = float(root_mean_squared_error(y_test, y_pred))
 
+    # HistGradientBoostingRegressor has no feature_importances_; store
+    # permutation importances on the test slice for explain
+    perm = permutation_importance(
+        model, X_test, y_test, n_repeats=5, random_state=seed, n_jobs=-1
+    )
+
     metrics = {
         "MAE_mgdl": round(mae, 2),
         "RMSE_mgdl": round(rmse, 2),
@@ -77,8 +90,15 @@ def train(
 
     model_path = Path(model_path)
     model_path.parent.mkdir(parents=True, exist_ok=True)
-    with open(model_path, "wb") as f:
-        pickle.dump({"model": model, "feature_names": list(X.columns)}, f)
+    # uncompressed so predict/explain can load the arrays with mmap_mode="r"
+    joblib.dump(
+        {
+            "model": model,
+            "feature_names": list(X.columns),
+            "feature_importances": perm.importances_mean,
+        },
+        model_path,
+    )
 
     metrics_path = model_path.parent / "metrics.json"
     with open(metrics_path, "w") as f:
@@ -8,8 +8,10 @@ from diabetes_explainer.features import FEATURE_DESCRIPTIONS, LAG_STEPS, build_f
 from diabetes_explainer.synth_data import generate
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_df():
+    # session-scoped: generate+validate once for the whole run; tests must not
+    # mutate the frame (copy inside the test body if needed)
     df = generate(n_days=3, seed=42)
     return data_schema.validate(df)
 
@@ -2,6 +2,7 @@
 
 import pandas as pd
 
+from diabetes_explainer import synth_data
 from diabetes_explainer.data_schema import OPTIONAL_COLUMNS, REQUIRED_COLUMNS
 from diabetes_explainer.synth_data import generate
 
@@ -30,6 +31,9 @@ def test_generate_n_days():
 
 def test_generate_reproducible():
     df1 = generate(n_days=1, seed=99)
+    # clear the frame cache so the second call re-runs the simulation
+    # instead of returning a copy of the first result
+    synth_data._GENERATE_CACHE.clear()
     df2 = generate(n_days=1, seed=99)
     pd.testing.assert_frame_equal(df1, df2)
 
@@ -1,6 +1,6 @@
 """Smoke tests for training pipeline."""
 
-import pickle
+import joblib
 
 from diabetes_explainer.train import train
 
@@ -16,11 +16,10 @@ def test_train_smoke(tmp_path):
 
 
 def test_train_model_loadable(tmp_path):
-    """Trained model pickle should contain model and feature_names keys."""
+    """Trained model artefact should contain model and feature_names keys."""
     model_path = tmp_path / "model.pkl"
     train(data_path=None, model_path=model_path, seed=1)
-    with open(model_path, "rb") as f:
-        artefact = pickle.load(f)
+    artefact = joblib.load(model_path)
     assert "model" in artefact
     assert "feature_names" in artefact
 